@@ -0,0 +1,237 @@
+import swisseph as swe
+import numpy as np
+from typing import Dict, Iterable, List
+
+# Ascendant is a contributor in every Ashtakavarga table but has no swe id
+LAGNA = -1
+
+ASHTAKAVARGA_PLANETS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN]
+CONTRIBUTORS = ASHTAKAVARGA_PLANETS + [LAGNA]
+
+# Benefic places (houses counted from each contributor) as per Parashara
+BENEFIC_PLACES = {
+    swe.SUN: {
+        swe.SUN: (1, 2, 4, 7, 8, 9, 10, 11),
+        swe.MOON: (3, 6, 10, 11),
+        swe.MARS: (1, 2, 4, 7, 8, 9, 10, 11),
+        swe.MERCURY: (3, 5, 6, 9, 10, 11, 12),
+        swe.JUPITER: (5, 6, 9, 11),
+        swe.VENUS: (6, 7, 12),
+        swe.SATURN: (1, 2, 4, 7, 8, 9, 10, 11),
+        LAGNA: (3, 4, 6, 10, 11, 12),
+    },
+    swe.MOON: {
+        swe.SUN: (3, 6, 7, 8, 10, 11),
+        swe.MOON: (1, 3, 6, 7, 10, 11),
+        swe.MARS: (2, 3, 5, 6, 9, 10, 11),
+        swe.MERCURY: (1, 3, 4, 5, 7, 8, 10, 11),
+        swe.JUPITER: (1, 4, 7, 8, 10, 11, 12),
+        swe.VENUS: (3, 4, 5, 7, 9, 10, 11),
+        swe.SATURN: (3, 5, 6, 11),
+        LAGNA: (3, 6, 10, 11),
+    },
+    swe.MARS: {
+        swe.SUN: (3, 5, 6, 10, 11),
+        swe.MOON: (3, 6, 11),
+        swe.MARS: (1, 2, 4, 7, 8, 10, 11),
+        swe.MERCURY: (3, 5, 6, 11),
+        swe.JUPITER: (6, 10, 11, 12),
+        swe.VENUS: (6, 8, 11, 12),
+        swe.SATURN: (1, 4, 7, 8, 9, 10, 11),
+        LAGNA: (1, 3, 6, 10, 11),
+    },
+    swe.MERCURY: {
+        swe.SUN: (5, 6, 9, 11, 12),
+        swe.MOON: (2, 4, 6, 8, 10, 11),
+        swe.MARS: (1, 2, 4, 7, 8, 9, 10, 11),
+        swe.MERCURY: (1, 3, 5, 6, 9, 10, 11, 12),
+        swe.JUPITER: (6, 8, 11, 12),
+        swe.VENUS: (1, 2, 3, 4, 5, 8, 9, 11),
+        swe.SATURN: (1, 2, 4, 7, 8, 9, 10, 11),
+        LAGNA: (1, 2, 4, 6, 8, 10, 11),
+    },
+    swe.JUPITER: {
+        swe.SUN: (1, 2, 3, 4, 7, 8, 9, 10, 11),
+        swe.MOON: (2, 5, 7, 9, 11),
+        swe.MARS: (1, 2, 4, 7, 8, 10, 11),
+        swe.MERCURY: (1, 2, 4, 5, 6, 9, 10, 11),
+        swe.JUPITER: (1, 2, 3, 4, 7, 8, 10, 11),
+        swe.VENUS: (2, 5, 6, 9, 10, 11),
+        swe.SATURN: (3, 5, 6, 12),
+        LAGNA: (1, 2, 4, 5, 6, 7, 9, 10, 11),
+    },
+    swe.VENUS: {
+        swe.SUN: (8, 11, 12),
+        swe.MOON: (1, 2, 3, 4, 5, 8, 9, 11, 12),
+        swe.MARS: (3, 5, 6, 9, 11, 12),
+        swe.MERCURY: (3, 5, 6, 9, 11),
+        swe.JUPITER: (5, 8, 9, 10, 11),
+        swe.VENUS: (1, 2, 3, 4, 5, 8, 9, 10, 11),
+        swe.SATURN: (3, 4, 5, 8, 9, 10, 11),
+        LAGNA: (1, 2, 3, 4, 5, 8, 9, 11),
+    },
+    swe.SATURN: {
+        swe.SUN: (1, 2, 4, 7, 8, 10, 11),
+        swe.MOON: (3, 6, 11),
+        swe.MARS: (3, 5, 6, 10, 11, 12),
+        swe.MERCURY: (6, 8, 9, 10, 11, 12),
+        swe.JUPITER: (5, 6, 11, 12),
+        swe.VENUS: (6, 11, 12),
+        swe.SATURN: (3, 5, 6, 11),
+        LAGNA: (1, 3, 4, 6, 10, 11),
+    },
+}
+
+SIGN_MASK = 0xFFF
+
+
+def houses_to_mask(houses: Iterable[int]) -> int:
+    """Convert house numbers (1-12) into a 12-bit mask, bit 0 being the 1st house."""
+    mask = 0
+    for house in houses:
+        mask |= 1 << (house - 1)
+    return mask
+
+
+def rotate_mask(mask: int, shift: int) -> int:
+    """Rotate a 12-bit mask left so that house bits become sign bits."""
+    shift %= 12
+    return ((mask << shift) | (mask >> (12 - shift))) & SIGN_MASK
+
+
+# Precomputed benefic masks: BENEFIC_MASKS[planet][contributor] -> 12-bit mask
+BENEFIC_MASKS = {
+    planet: {contributor: houses_to_mask(houses) for contributor, houses in places.items()}
+    for planet, places in BENEFIC_PLACES.items()
+}
+
+# Precomputed rotations: ROTATED_MASKS[planet][contributor][sign] -> sign-indexed mask
+ROTATED_MASKS = {
+    planet: {contributor: tuple(rotate_mask(mask, sign) for sign in range(12))
+             for contributor, mask in masks.items()}
+    for planet, masks in BENEFIC_MASKS.items()
+}
+
+# Rotated masks unpacked into per-sign bindu counts, laid out for fancy indexing:
+# BINDU_TABLE[contributor index, contributor sign, planet index, sign] -> 0 or 1
+BINDU_TABLE = np.array([
+    [[[(ROTATED_MASKS[planet][contributor][contributor_sign] >> sign) & 1 for sign in range(12)]
+      for planet in ASHTAKAVARGA_PLANETS]
+     for contributor_sign in range(12)]
+    for contributor in CONTRIBUTORS
+], dtype=np.uint8)
+
+
+def longitude_to_sign(longitude: float) -> int:
+    """Get the zodiac sign (0-11) for a longitude in degrees."""
+    # Tiny negative longitudes wrap to exactly 360.0 in floating point
+    return min(int(longitude % 360 / 30), 11)
+
+
+def get_contributor_signs(planetary_positions: Dict[int, float], ascendant: float) -> Dict[int, int]:
+    """Get the sign occupied by each Ashtakavarga contributor."""
+    signs = {planet: longitude_to_sign(planetary_positions[planet]) for planet in ASHTAKAVARGA_PLANETS}
+    signs[LAGNA] = longitude_to_sign(ascendant)
+    return signs
+
+
+def get_contributor_sign_array(planetary_positions: np.ndarray, ascendants: np.ndarray) -> np.ndarray:
+    """
+    Get contributor signs for many charts.
+    planetary_positions has one row per chart with longitudes in ASHTAKAVARGA_PLANETS order.
+    Returns an (charts, contributors) array of signs in CONTRIBUTORS order.
+    """
+    longitudes = np.column_stack([planetary_positions, ascendants])
+    return np.minimum(longitudes % 360 // 30, 11).astype(np.intp)
+
+
+def calculate_bhinnashtakavarga_array(contributor_signs: np.ndarray) -> np.ndarray:
+    """Calculate Bhinnashtakavarga for many charts as a (charts, planets, signs) array."""
+    bindus = np.zeros((contributor_signs.shape[0], len(ASHTAKAVARGA_PLANETS), 12), dtype=np.uint8)
+    for contributor_index in range(len(CONTRIBUTORS)):
+        bindus += BINDU_TABLE[contributor_index][contributor_signs[:, contributor_index]]
+    return bindus
+
+
+def calculate_bhinnashtakavarga(planetary_positions: Dict[int, float], ascendant: float) -> Dict[int, List[int]]:
+    """Calculate Bhinnashtakavarga: bindus per sign for each planet."""
+    signs = get_contributor_signs(planetary_positions, ascendant)
+    contributor_signs = [signs[contributor] for contributor in CONTRIBUTORS]
+    bindus = BINDU_TABLE[np.arange(len(CONTRIBUTORS)), contributor_signs].sum(axis=0)
+    return {planet: bindus[i].tolist() for i, planet in enumerate(ASHTAKAVARGA_PLANETS)}
+
+
+def calculate_sarvashtakavarga(bhinnashtakavarga: Dict[int, List[int]]) -> List[int]:
+    """Calculate Sarvashtakavarga by adding the Bhinnashtakavarga of all planets."""
+    return [sum(bindus[sign] for bindus in bhinnashtakavarga.values()) for sign in range(12)]
+
+
+def calculate_ashtakavarga_batch(planetary_positions: np.ndarray, ascendants: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate Ashtakavarga for many charts in one vectorized pass.
+    planetary_positions is a (charts, 7) array of longitudes in ASHTAKAVARGA_PLANETS order,
+    ascendants a (charts,) array.
+    """
+    planetary_positions = np.asarray(planetary_positions, dtype=float)
+    ascendants = np.asarray(ascendants, dtype=float)
+    if planetary_positions.ndim != 2 or planetary_positions.shape[1] != len(ASHTAKAVARGA_PLANETS):
+        raise ValueError(f"Planetary positions must have shape (charts, {len(ASHTAKAVARGA_PLANETS)}) "
+                         f"in ASHTAKAVARGA_PLANETS order, got {planetary_positions.shape}")
+    if ascendants.shape != (planetary_positions.shape[0],):
+        raise ValueError(f"Ascendants must have shape ({planetary_positions.shape[0]},), got {ascendants.shape}")
+
+    contributor_signs = get_contributor_sign_array(planetary_positions, ascendants)
+    bhinnashtakavarga = calculate_bhinnashtakavarga_array(contributor_signs)
+    return {
+        'bhinnashtakavarga': bhinnashtakavarga,
+        'sarvashtakavarga': bhinnashtakavarga.sum(axis=1, dtype=np.uint16),
+    }
+
+
+def calculate_transit_scores(bhinnashtakavarga: Dict[int, List[int]],
+                             transit_positions: Dict[int, float]) -> Dict[int, int]:
+    """Get the bindus each transiting planet receives in the natal Bhinnashtakavarga."""
+    return {planet: bhinnashtakavarga[planet][longitude_to_sign(transit_positions[planet])]
+            for planet in ASHTAKAVARGA_PLANETS if planet in transit_positions}
+
+
+def calculate_transit_scores_batch(bhinnashtakavarga: np.ndarray, transit_positions: Dict[int, float]) -> Dict:
+    """
+    Score one set of transit positions against many natal charts.
+    Takes the (charts, planets, signs) array from calculate_ashtakavarga_batch. Like
+    calculate_transit_scores, planets missing from transit_positions are skipped: 'planets'
+    lists the planets scored and 'scores' is a (charts, len(planets)) array of bindus.
+    """
+    planet_indices = [i for i, planet in enumerate(ASHTAKAVARGA_PLANETS) if planet in transit_positions]
+    # Transit signs are shared by every chart, so resolve them only once
+    transit_signs = [longitude_to_sign(transit_positions[ASHTAKAVARGA_PLANETS[i]]) for i in planet_indices]
+    return {
+        'planets': [ASHTAKAVARGA_PLANETS[i] for i in planet_indices],
+        'scores': bhinnashtakavarga[:, planet_indices, transit_signs],
+    }
+
+
+class AshtakavargaCalculator:
+    def __init__(self, kundli):
+        self.kundli = kundli
+        self.bhinnashtakavarga = {}
+        self.sarvashtakavarga = []
+
+    def calculate(self) -> Dict:
+        """Calculate Bhinnashtakavarga and Sarvashtakavarga for the kundli."""
+        if self.kundli.ascendant is None or not self.kundli.planetary_positions:
+            raise ValueError("Ascendant and planetary positions must be calculated before Ashtakavarga")
+
+        self.bhinnashtakavarga = calculate_bhinnashtakavarga(self.kundli.planetary_positions,
+                                                             self.kundli.ascendant)
+        self.sarvashtakavarga = calculate_sarvashtakavarga(self.bhinnashtakavarga)
+        return {
+            'bhinnashtakavarga': self.bhinnashtakavarga,
+            'sarvashtakavarga': self.sarvashtakavarga,
+        }
+
+    def get_transit_scores(self, transit_positions: Dict[int, float]) -> Dict[int, int]:
+        """Get bindus per planet for the given transit positions."""
+        if not self.bhinnashtakavarga:
+            self.calculate()
+        return calculate_transit_scores(self.bhinnashtakavarga, transit_positions)
@@ -0,0 +1,215 @@
+import swisseph as swe
+import numpy as np
+from typing import Dict, List, Tuple
+
+ANGLES = ["ASC", "MC", "DSC", "IC"]
+
+RELOCATION_PLANETS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE]
+
+
+def calculate_angles(armc: np.ndarray, lat: np.ndarray, obliquity: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate ascendant and MC (ecliptic degrees) from ARMC and latitude.
+    Works element-wise on arrays of any matching/broadcastable shape.
+    """
+    ramc = np.radians(armc)
+    phi = np.radians(lat)
+    eps = np.radians(obliquity)
+    mc = np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(eps))) % 360
+    asc = np.degrees(np.arctan2(np.cos(ramc),
+                                -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps)))) % 360
+    # Inside the polar circles the formula can give the western intersection; like Swiss
+    # Ephemeris, keep the ascendant in the half of the ecliptic following the MC
+    asc = np.where((asc - mc) % 360 > 180, (asc + 180) % 360, asc)
+    return asc, mc
+
+
+def calculate_semi_arc(lat: np.ndarray, dec: np.ndarray) -> np.ndarray:
+    """
+    Semi-diurnal arc (hour angle in degrees from MC to rising/setting) for a declination at a latitude.
+    NaN where the body is circumpolar and never rises or sets.
+    """
+    cos_h = -np.tan(np.radians(lat)) * np.tan(np.radians(dec))
+    with np.errstate(invalid='ignore'):
+        return np.degrees(np.arccos(np.where(np.abs(cos_h) <= 1, cos_h, np.nan)))
+
+
+def angular_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Smallest separation in degrees between two longitudes."""
+    return np.abs((a - b + 180) % 360 - 180)
+
+
+class RelocationEngine:
+    def __init__(self, kundli, orb: float = 5.0):
+        self.kundli = kundli
+        self.orb = orb  # Max hour-angle distance (degrees) of a planet from an angle to count as angular
+        self.sidereal_time = None  # Greenwich apparent sidereal time in degrees
+        self.obliquity = None
+        self.equatorial_positions = {}
+
+    def prepare(self):
+        """Compute everything that does not depend on location (one swe call per body)."""
+        if self.kundli.julian_day is None:
+            self.kundli.calculate_julian_day()
+        jd = self.kundli.julian_day
+
+        self.sidereal_time = swe.sidtime(jd) * 15
+        ecl_nut, _ = swe.calc_ut(jd, swe.ECL_NUT)
+        self.obliquity = ecl_nut[0]  # True obliquity of the ecliptic
+
+        for planet in RELOCATION_PLANETS:
+            eq_pos, _ = swe.calc_ut(jd, planet, swe.FLG_EQUATORIAL)
+            self.equatorial_positions[planet] = (eq_pos[0], eq_pos[1])  # Right ascension, declination
+        # Ketu is always opposite Rahu
+        rahu_ra, rahu_dec = self.equatorial_positions[swe.MEAN_NODE]
+        self.equatorial_positions[swe.MEAN_NODE + 1] = ((rahu_ra + 180) % 360, -rahu_dec)
+
+    def calculate_points(self, lat: np.ndarray, lon: np.ndarray) -> Dict:
+        """
+        Calculate ascendant, MC and angular planets for arrays of coordinates.
+        A planet is angular when its hour angle is within the orb of the meridian (MC/IC) or of
+        its rising/setting hour angle (ASC/DSC), the same criterion calculate_lines() draws.
+        """
+        if self.sidereal_time is None:
+            self.prepare()
+
+        armc = (self.sidereal_time + lon) % 360
+        asc, mc = calculate_angles(armc, lat, self.obliquity)
+
+        planets = list(self.equatorial_positions.keys())
+        shape = (-1,) + (1,) * asc.ndim
+        ra = np.array([self.equatorial_positions[planet][0] for planet in planets]).reshape(shape)
+        dec = np.array([self.equatorial_positions[planet][1] for planet in planets]).reshape(shape)
+        hour_angle = armc[np.newaxis] - ra
+        semi_arc = calculate_semi_arc(lat[np.newaxis], dec)
+        # distances[p, a, ...] -> hour-angle separation of planet p from angle a (ANGLES order)
+        distances = np.stack([angular_distance(hour_angle, -semi_arc),
+                              angular_distance(hour_angle, 0),
+                              angular_distance(hour_angle, semi_arc),
+                              angular_distance(hour_angle, 180)], axis=1)
+        distances = np.where(np.isnan(distances), np.inf, distances)
+        nearest = distances.argmin(axis=1)
+        angular = np.where(distances.min(axis=1) <= self.orb, nearest, -1).astype(np.int8)
+
+        return {
+            'ascendant': asc,
+            'mc': mc,
+            'planets': planets,
+            'angular': angular,  # Index into ANGLES per planet/point, -1 if not angular
+        }
+
+    def calculate_grid(self, lat_step: float = 1.0, lon_step: float = 1.0,
+                       lat_limit: float = 89.0) -> Dict:
+        """Calculate angles over a world lat/lon grid in one vectorized pass."""
+        lats = np.arange(-lat_limit, lat_limit + lat_step / 2, lat_step)
+        lons = np.arange(-180.0, 180.0, lon_step)
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing='ij')
+
+        result = self.calculate_points(lat_grid, lon_grid)
+        result['latitudes'] = lats
+        result['longitudes'] = lons
+        return result
+
+    def calculate_locations(self, locations: List[Tuple[str, float, float]]) -> List[Dict]:
+        """Calculate angles and angular planets for a list of (name, lat, lon) locations."""
+        lat = np.array([location[1] for location in locations], dtype=float)
+        lon = np.array([location[2] for location in locations], dtype=float)
+        result = self.calculate_points(lat, lon)
+
+        relocated = []
+        for i, (name, location_lat, location_lon) in enumerate(locations):
+            angular_planets = {}
+            for p, planet in enumerate(result['planets']):
+                angle_index = result['angular'][p, i]
+                if angle_index >= 0:
+                    angular_planets.setdefault(ANGLES[angle_index], []).append(planet)
+            relocated.append({
+                'place': name,
+                'latitude': location_lat,
+                'longitude': location_lon,
+                'ascendant': float(result['ascendant'][i]),
+                'mc': float(result['mc'][i]),
+                'angular_planets': angular_planets,
+            })
+        return relocated
+
+    def calculate_lines(self, lat_step: float = 1.0, lat_limit: float = 89.0) -> Dict:
+        """
+        Calculate astrocartography lines (where each planet is on an angle) for map rendering.
+        MC/IC lines are single meridians; ASC/DSC lines give a longitude per latitude,
+        None where the planet is circumpolar and never rises or sets.
+        """
+        if self.sidereal_time is None:
+            self.prepare()
+
+        lats = np.arange(-lat_limit, lat_limit + lat_step / 2, lat_step)
+
+        lines = {'latitudes': lats.tolist(), 'planets': {}}
+        for planet, (ra, dec) in self.equatorial_positions.items():
+            mc_lon = (ra - self.sidereal_time + 180) % 360 - 180
+            semi_arc = calculate_semi_arc(lats, dec)
+            asc_lon = (ra - semi_arc - self.sidereal_time + 180) % 360 - 180
+            dsc_lon = (ra + semi_arc - self.sidereal_time + 180) % 360 - 180
+
+            lines['planets'][planet] = {
+                'MC': float(mc_lon),
+                'IC': float((mc_lon + 360) % 360 - 180),
+                'ASC': [None if np.isnan(value) else float(value) for value in asc_lon],
+                'DSC': [None if np.isnan(value) else float(value) for value in dsc_lon],
+            }
+        lines['crossings'] = self.calculate_crossings(lat_limit)
+        return lines
+
+    def calculate_crossings(self, lat_limit: float = 89.0) -> List[Dict]:
+        """
+        Calculate where one planet's ASC/DSC line crosses another planet's MC/IC meridian (parans).
+        Planet A rises on B's meridian where A's semi-diurnal arc equals the hour angle between
+        them, which gives the latitude directly: tan(lat) = -cos(semi_arc) / tan(dec_A).
+        """
+        if self.sidereal_time is None:
+            self.prepare()
+
+        planets = list(self.equatorial_positions.keys())
+        ra = np.array([self.equatorial_positions[planet][0] for planet in planets])
+        dec = np.array([self.equatorial_positions[planet][1] for planet in planets])
+        # Row: horizon planet A, column: meridian planet B
+        tan_dec = np.tan(np.radians(dec))[:, np.newaxis]
+        off_diagonal = ~np.eye(len(planets), dtype=bool)
+
+        crossings = []
+        for meridian, offset in (("MC", 0.0), ("IC", 180.0)):
+            meridian_ra = (ra + offset) % 360
+            for horizon, direction in (("ASC", 1), ("DSC", -1)):
+                # ASC: LST = ra_A - semi_arc, DSC: LST = ra_A + semi_arc, with LST = meridian RA
+                semi_arc = direction * (ra[:, np.newaxis] - meridian_ra[np.newaxis]) % 360
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    lat = np.degrees(np.arctan(-np.cos(np.radians(semi_arc)) / tan_dec))
+                # 0 and 180 are tangent points at the circumpolar limit (e.g. Rahu/Ketu), not crossings
+                valid = ((semi_arc > 1e-9) & (semi_arc < 180 - 1e-9) & off_diagonal
+                         & (tan_dec != 0) & (np.abs(lat) <= lat_limit))
+                for a, b in zip(*np.nonzero(valid)):
+                    crossings.append({
+                        'planets': [planets[a], planets[b]],
+                        'angles': [horizon, meridian],
+                        'latitude': float(lat[a, b]),
+                        'longitude': float((meridian_ra[b] - self.sidereal_time + 180) % 360 - 180),
+                    })
+        return crossings
+
+    def verify_with_swe(self, locations: List[Tuple[str, float, float]]) -> float:
+        """
+        Compare vectorized ascendant/MC against swe.houses() for (name, lat, lon) locations
+        and return the max error in degrees. Uses Porphyry houses, whose Asc/MC are defined
+        at every latitude (Placidus fails beyond the polar circles).
+        """
+        lat = np.array([location[1] for location in locations], dtype=float)
+        lon = np.array([location[2] for location in locations], dtype=float)
+        result = self.calculate_points(lat, lon)
+
+        max_error = 0.0
+        for i, (_, location_lat, location_lon) in enumerate(locations):
+            _, ascmc = swe.houses(self.kundli.julian_day, location_lat, location_lon, b'O')
+            max_error = max(max_error,
+                            float(angular_distance(result['ascendant'][i], ascmc[0])),
+                            float(angular_distance(result['mc'][i], ascmc[1])))
+        return max_error
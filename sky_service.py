@@ -0,0 +1,325 @@
+import os
+import sys
+import json
+import time
+import logging
+import datetime
+import tempfile
+import threading
+import numpy as np
+import swisseph as swe
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, List, Tuple
+from util import EnhancedKundliGenerator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+SHM_NAME = "atmaveda_sky"
+REFRESH_INTERVAL = 60  # Seconds between recomputations of the current sky
+MAX_AGE = 3 * REFRESH_INTERVAL  # Seconds after which a reader reports the sky as stale
+READ_TIMEOUT = 1.0  # Seconds a reader waits for a consistent snapshot
+UNIX_EPOCH_JD = 2440587.5  # Julian day of 1970-01-01 00:00 UT
+
+# Main cities whose ascendant is kept current: (name, latitude, longitude)
+DEFAULT_LOCATIONS = [
+    ("New Delhi", 28.6139, 77.2090),
+    ("Mumbai", 19.0760, 72.8777),
+    ("Bengaluru", 12.9716, 77.5946),
+    ("Kolkata", 22.5726, 88.3639),
+    ("Chennai", 13.0827, 80.2707),
+    ("Hyderabad", 17.3850, 78.4867),
+]
+
+SKY_PLANETS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN,
+               swe.MEAN_NODE, swe.MEAN_NODE + 1]
+
+# Shared block layout:
+#   uint64 sequence counter (odd while a write is in progress)
+#   uint64 number of locations N, written once when the block is created
+#   N location names, NAME_SIZE bytes each (utf-8, null padded)
+#   N (latitude, longitude) float64 pairs
+#   float64 data: [0] julian day, [1] moon nakshatra index, [2] moon pada,
+#                 [3:3+len(SKY_PLANETS)] planet longitudes, then one ascendant per location
+SEQ_SIZE = 8
+COUNT_SIZE = 8
+NAME_SIZE = 64
+HEADER_FIELDS = 3
+
+
+def get_block_size(num_locations: int) -> int:
+    """Size in bytes of the shared block for the given number of locations."""
+    return (SEQ_SIZE + COUNT_SIZE + num_locations * (NAME_SIZE + 16)
+            + 8 * (HEADER_FIELDS + len(SKY_PLANETS) + num_locations))
+
+
+def map_block(shm: shared_memory.SharedMemory, num_locations: int) -> Dict[str, np.ndarray]:
+    """Create zero-copy views of every section of the shared block."""
+    offset = SEQ_SIZE + COUNT_SIZE
+    names = np.ndarray((num_locations,), dtype=f"S{NAME_SIZE}", buffer=shm.buf, offset=offset)
+    offset += num_locations * NAME_SIZE
+    coordinates = np.ndarray((num_locations, 2), dtype=np.float64, buffer=shm.buf, offset=offset)
+    offset += num_locations * 16
+    return {
+        'seq': np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=0),
+        'count': np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=SEQ_SIZE),
+        'names': names,
+        'coordinates': coordinates,
+        'data': np.ndarray((HEADER_FIELDS + len(SKY_PLANETS) + num_locations,), dtype=np.float64,
+                           buffer=shm.buf, offset=offset),
+    }
+
+
+def read_locations(shm: shared_memory.SharedMemory) -> List[Tuple[str, float, float]]:
+    """Read the (name, lat, lon) locations stored in a block's header, [] if it has no valid header."""
+    if shm.size < SEQ_SIZE + COUNT_SIZE:
+        return []
+    num_locations = int(np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=SEQ_SIZE)[0])
+    if shm.size < get_block_size(num_locations):
+        return []
+    block = map_block(shm, num_locations)
+    locations = [(name.decode('utf-8', errors='replace'), float(lat), float(lon))
+                 for name, (lat, lon) in zip(block['names'], block['coordinates'])]
+    del block
+    return locations
+
+
+def open_block(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """
+    Open a shared block without leaving it to the resource tracker, which would otherwise
+    unlink it when any attached process exits. SkyPublisher manages the block's lifetime.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    if os.name == "posix":
+        # The tracker knows POSIX blocks by their leading-slash name, which .name strips
+        resource_tracker.unregister("/" + shm.name, "shared_memory")
+    return shm
+
+
+def unlink_block(shm: shared_memory.SharedMemory):
+    """Remove a block opened with open_block()."""
+    if sys.version_info < (3, 13) and os.name == "posix":
+        # unlink() unregisters the block from the tracker, so balance it first
+        resource_tracker.register("/" + shm.name, "shared_memory")
+    shm.unlink()
+
+
+def acquire_writer_lock(name: str):
+    """
+    Take the exclusive publisher lock for a shared block, so only one live SkyPublisher writes it.
+    The OS releases the lock when the holder exits, even on a crash. Returns the open lock file.
+    """
+    lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a+")
+    try:
+        if os.name == "nt":
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        raise RuntimeError(f"Another SkyPublisher is already running for shared block {name}")
+    return lock_file
+
+
+def get_current_julian_day() -> float:
+    """Julian day (UT) for the current moment."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return swe.julday(now.year, now.month, now.day,
+                      now.hour + now.minute / 60.0 + now.second / 3600.0 + now.microsecond / 3600e6)
+
+
+def calculate_current_sky(locations: List[Tuple[str, float, float]], julian_day: float = None) -> np.ndarray:
+    """Compute the chart of the moment as a flat array in the shared block data layout."""
+    if julian_day is None:
+        julian_day = get_current_julian_day()
+
+    kundli = EnhancedKundliGenerator(None, None, None, None, None)
+    kundli.julian_day = julian_day
+    kundli.calculate_planetary_positions()
+    moon_nakshatra = kundli.calculate_nakshatra(kundli.planetary_positions[swe.MOON])
+
+    values = [julian_day,
+              kundli.NAKSHATRA_NAMES.index(moon_nakshatra['nakshatra']),
+              moon_nakshatra['pada']]
+    values.extend(kundli.planetary_positions[planet] for planet in SKY_PLANETS)
+    for _, lat, lon in locations:
+        _, ascmc = swe.houses(julian_day, lat, lon, b'P')
+        values.append(float(ascmc[0]))
+    return np.array(values, dtype=np.float64)
+
+
+class SkyPublisher:
+    def __init__(self, locations: List[Tuple[str, float, float]] = None, name: str = SHM_NAME,
+                 interval: float = REFRESH_INTERVAL):
+        self.locations = [(location_name, float(lat), float(lon))
+                          for location_name, lat, lon in (locations or DEFAULT_LOCATIONS)]
+        self.interval = interval
+        # Held for the publisher's lifetime; any existing block therefore has no live writer
+        self.lock_file = acquire_writer_lock(name)
+        try:
+            self.shm = self.open_or_reuse_block(name)
+        except Exception:
+            self.lock_file.close()
+            raise
+        self.block = map_block(self.shm, len(self.locations))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def open_or_reuse_block(self, name: str) -> shared_memory.SharedMemory:
+        """
+        Create the shared block, taking over one left behind by a crashed publisher
+        (the writer lock guarantees its owner is no longer running).
+        A leftover block with the same locations is reused so attached readers keep working;
+        otherwise it is replaced.
+        """
+        size = get_block_size(len(self.locations))
+        try:
+            shm = open_block(name, create=True, size=size)
+        except FileExistsError:
+            shm = open_block(name)
+            stored = [(location_name.encode('utf-8')[:NAME_SIZE].decode('utf-8', errors='replace'), lat, lon)
+                      for location_name, lat, lon in self.locations]
+            if read_locations(shm) == stored:
+                logger.info("Reusing existing shared sky block %s", name)
+                return shm
+            logger.warning("Replacing shared sky block %s with a different layout", name)
+            unlink_block(shm)
+            shm.close()
+            shm = open_block(name, create=True, size=size)
+
+        block = map_block(shm, len(self.locations))
+        block['seq'][0] = 0
+        block['names'][:] = [location_name.encode('utf-8')[:NAME_SIZE] for location_name, _, _ in self.locations]
+        block['coordinates'][:] = [(lat, lon) for _, lat, lon in self.locations]
+        block['count'][0] = len(self.locations)
+        del block
+        return shm
+
+    def publish(self, julian_day: float = None):
+        """Recompute the current sky and publish it (seqlock: odd sequence while writing)."""
+        values = calculate_current_sky(self.locations, julian_day)
+        seq = self.block['seq']
+        # OR rather than increment: a publisher killed mid-write leaves the counter odd
+        seq[0] |= np.uint64(1)
+        self.block['data'][:] = values
+        seq[0] += np.uint64(1)
+
+    def run_forever(self):
+        """Publish the current sky every interval until stopped; errors are logged and retried."""
+        while not self._stop_event.is_set():
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("Failed to publish the current sky")
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Start refreshing in a background thread."""
+        self._thread = threading.Thread(target=self.run_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop refreshing and remove the shared block."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        del self.block
+        unlink_block(self.shm)
+        self.shm.close()
+        self.lock_file.close()
+
+
+class SkyReader:
+    def __init__(self, name: str = SHM_NAME, timeout: float = READ_TIMEOUT, max_age: float = MAX_AGE):
+        self.timeout = timeout
+        self.max_age = max_age
+        self.shm = open_block(name)
+        self.locations = read_locations(self.shm)
+        if not self.locations:
+            self.shm.close()
+            raise ValueError(f"Shared sky block {name} has no valid header")
+        self.block = map_block(self.shm, len(self.locations))
+        self.nakshatra_names = EnhancedKundliGenerator(None, None, None, None, None).NAKSHATRA_NAMES
+        self._cached_seq = None
+        self._cached_sky = None
+
+    @property
+    def sequence(self) -> int:
+        """Current sequence counter of the shared block."""
+        return int(self.block['seq'][0])
+
+    def read_raw(self) -> Tuple[int, np.ndarray]:
+        """
+        Read a consistent copy of the data fields without taking a lock.
+        Raises TimeoutError if nothing consistent is published within the timeout.
+        """
+        seq = self.block['seq']
+        deadline = time.monotonic() + self.timeout
+        while True:
+            start_seq = int(seq[0])
+            if start_seq and not start_seq % 2:
+                values = self.block['data'].copy()
+                if int(seq[0]) == start_seq:
+                    return start_seq, values
+            if time.monotonic() > deadline:
+                state = "nothing published yet" if start_seq == 0 else "publisher stuck mid-write"
+                raise TimeoutError(f"No consistent sky in shared block {self.shm.name} ({state})")
+            # Nothing published yet or a write is in progress
+            time.sleep(0.001)
+
+    def read(self) -> Dict:
+        """
+        Get the latest sky, reusing the parsed result while the sequence is unchanged.
+        Returns a shallow copy with 'age_seconds' and 'stale' reporting how old the published
+        moment is; no swe calls are made.
+        """
+        if self._cached_sky is None or int(self.block['seq'][0]) != self._cached_seq:
+            seq, values = self.read_raw()
+            num_planets = len(SKY_PLANETS)
+            planet_values = values[HEADER_FIELDS:HEADER_FIELDS + num_planets]
+            ascendant_values = values[HEADER_FIELDS + num_planets:]
+
+            self._cached_seq = seq
+            self._cached_sky = {
+                'sequence': seq,
+                'julian_day': float(values[0]),
+                'moon_nakshatra': {
+                    'nakshatra': self.nakshatra_names[int(values[1])],
+                    'pada': int(values[2]),
+                },
+                'planetary_positions': {planet: float(pos) for planet, pos in zip(SKY_PLANETS, planet_values)},
+                'ascendants': {name: float(asc) for (name, _, _), asc in zip(self.locations, ascendant_values)},
+            }
+
+        sky = dict(self._cached_sky)
+        sky['age_seconds'] = time.time() - (sky['julian_day'] - UNIX_EPOCH_JD) * 86400
+        sky['stale'] = sky['age_seconds'] > self.max_age
+        return sky
+
+    def close(self):
+        """Detach from the shared block."""
+        del self.block
+        self.shm.close()
+
+
+if __name__ == "__main__":
+    # `python sky_service.py` runs the refresher, `python sky_service.py read` prints the latest sky
+    if len(sys.argv) > 1 and sys.argv[1] == "read":
+        reader = SkyReader()
+        print(json.dumps(reader.read()))
+        reader.close()
+    else:
+        logging.basicConfig(level=logging.INFO)
+        publisher = SkyPublisher()
+        try:
+            publisher.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            publisher.stop()